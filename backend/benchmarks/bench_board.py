@@ -0,0 +1,124 @@
+# Бенчмарк масштабирования PixelBoard: время старта, RSS и стоимость set_pixel
+# (включая накладные расходы BoardStats) в зависимости от размера доски.
+# Запуск из каталога backend: python benchmarks/bench_board.py [--sizes 1000 5000 20000]
+from sys import path as syspath
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+syspath.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "internal"))
+
+
+class BenchConfig:
+    is_volatile_mode = True
+    stats_tile_size = 64
+    stats_bucket_seconds = 60
+    stats_windows = [60, 600, 3600]
+
+    def __init__(self, chunk_size: int):
+        self.board_chunk_size = chunk_size
+
+
+# Заглушка статистики для замера set_pixel без BoardStats
+class NoStats:
+    def record(self, x: int, y: int, color_id: int, previous_id: int):
+        pass
+
+
+def rss_mib() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_single(size: int, chunk_size: int, writes: int) -> dict:
+    from board import PixelBoard
+    from config import Config
+
+    palette = Config.load_color_palettes()[0]
+    rss_before = rss_mib()
+
+    start = time.perf_counter()
+    board = PixelBoard(size, size, palette, None, BenchConfig(chunk_size))
+    startup = time.perf_counter() - start
+    rss_empty = rss_mib()
+
+    rng = random.Random(0)
+    colors = len(palette.colors)
+    placements = [(rng.randrange(size), rng.randrange(size), rng.randrange(1, colors)) for _ in range(writes)]
+    start = time.perf_counter()
+    for x, y, color_id in placements:
+        board.set_pixel(x, y, color_id)
+    write_time = time.perf_counter() - start
+    board.swap_changes()
+    rss_written = rss_mib()
+
+    start = time.perf_counter()
+    board.get_pixel_range(0, 0, min(size, 500), min(size, 500), asdictionary=True)
+    read_time = time.perf_counter() - start
+    chunk_stats = board.get_chunk_stats()
+
+    # Накладные расходы статистики: те же закрашивания на свежей доске без BoardStats
+    del board
+    baseline = PixelBoard(size, size, palette, None, BenchConfig(chunk_size))
+    baseline._stats = NoStats()
+    start = time.perf_counter()
+    for x, y, color_id in placements:
+        baseline.set_pixel(x, y, color_id)
+    baseline_time = time.perf_counter() - start
+
+    return {
+        "size": size,
+        "startup_s": startup,
+        "rss_empty_mib": rss_empty - rss_before,
+        "rss_written_mib": rss_written - rss_before,
+        "set_pixel_us": write_time / max(writes, 1) * 1e6,
+        "stats_us": (write_time - baseline_time) / max(writes, 1) * 1e6,
+        "range_500_ms": read_time * 1000,
+        "chunks_allocated": chunk_stats["chunks_allocated"],
+        "chunks_total": chunk_stats["chunks_total"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2500, 5000, 10000, 20000])
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--writes", type=int, default=100000)
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                result = run_single(args.single, args.chunk_size, args.writes)
+            finally:
+                sys.stdout = stdout
+        print(json.dumps(result))
+        return
+
+    print(f"{'size':>7} {'startup s':>10} {'RSS empty':>10} {'RSS written':>12} {'set_pixel us':>13} {'stats us':>9} {'range 500 ms':>13} {'chunks':>13}")
+    for size in args.sizes:
+        # Каждый размер в отдельном процессе, чтобы RSS не накапливался
+        output = subprocess.run(
+            [sys.executable, __file__, "--single", str(size), "--chunk-size", str(args.chunk_size), "--writes", str(args.writes)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(f"{r['size']:>7} {r['startup_s']:>10.4f} {r['rss_empty_mib']:>8.1f}Mi {r['rss_written_mib']:>10.1f}Mi "
+              f"{r['set_pixel_us']:>13.2f} {r['stats_us']:>9.2f} {r['range_500_ms']:>13.1f} {r['chunks_allocated']:>6}/{r['chunks_total']:<6}")
+
+
+if __name__ == "__main__":
+    main()
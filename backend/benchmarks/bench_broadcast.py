@@ -0,0 +1,167 @@
+# Бенчмарк задержки event loop во время рассылки больших пачек изменений.
+# Сравнивает старую схему (json.dumps на event loop) с двойным буфером и кодированием в потоке.
+# Запуск из каталога backend: python benchmarks/bench_broadcast.py [--changes 100000]
+from sys import path as syspath
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+syspath.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "internal"))
+syspath.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+class BenchConfig:
+    is_volatile_mode = True
+    board_chunk_size = 256
+    stats_tile_size = 64
+    stats_bucket_seconds = 60
+    stats_windows = [60, 600, 3600]
+
+
+SIZE = 2500
+PROBE_INTERVAL = 0.001
+
+
+class LagProbe:
+    def __init__(self):
+        self.max_lag: float = 0.0
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + PROBE_INTERVAL
+            await asyncio.sleep(PROBE_INTERVAL)
+            self.max_lag = max(self.max_lag, loop.time() - expected)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def make_placements(count: int, colors: int) -> list[tuple[int, int, int]]:
+    rng = random.Random(0)
+    return [(rng.randrange(SIZE), rng.randrange(SIZE), rng.randrange(colors)) for _ in range(count)]
+
+
+async def place_burst(board, placements):
+    # Имитация потока запросов: между пачками управление возвращается в loop
+    for start in range(0, len(placements), 1000):
+        for x, y, color_id in placements[start:start + 1000]:
+            board.set_pixel(x, y, color_id)
+        await asyncio.sleep(0)
+
+
+async def bench_legacy(board, placements) -> tuple[float, float, int]:
+    from board import Pixel
+    from internal.jsonenchanced import EnhancedJSONEncoder
+
+    legacy_changes: list[Pixel] = []
+    probe = LagProbe()
+    probe.start()
+    await place_burst(board, placements)
+    board.swap_changes()
+    for x, y, color_id in placements:
+        legacy_changes.append(Pixel(x=x, y=y, color=board.get_color(color_id)))
+    await asyncio.sleep(0.01)
+
+    probe.max_lag = 0.0
+    start = time.perf_counter()
+    data = json.dumps(legacy_changes, cls=EnhancedJSONEncoder)
+    encode_time = time.perf_counter() - start
+    await asyncio.sleep(0.01)
+    await probe.stop()
+    return encode_time, probe.max_lag, len(data)
+
+
+async def bench_double_buffer(board, placements) -> tuple[float, float, int]:
+    from changes import encode_changes
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    loop = asyncio.get_running_loop()
+    probe = LagProbe()
+    probe.start()
+    await place_burst(board, placements)
+    await asyncio.sleep(0.01)
+
+    probe.max_lag = 0.0
+    start = time.perf_counter()
+    changes = board.swap_changes()
+    data = await loop.run_in_executor(executor, encode_changes, changes, board.color_palette.colors)
+    encode_time = time.perf_counter() - start
+    await asyncio.sleep(0.01)
+    await probe.stop()
+    executor.shutdown()
+    return encode_time, probe.max_lag, len(data)
+
+
+async def check_concurrent_writers(board, placements, writers: int) -> tuple[int, int]:
+    # set_pixel из нескольких потоков одновременно со swap_changes: ни одно изменение не должно потеряться
+    from changes import encode_changes
+
+    board.swap_changes()
+    chunks = [placements[i::writers] for i in range(writers)]
+    threads = [
+        threading.Thread(target=lambda chunk=chunk: [board.set_pixel(x, y, c) for x, y, c in chunk])
+        for chunk in chunks
+    ]
+    for t in threads:
+        t.start()
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1)
+    received = 0
+    while True:
+        writing = any(t.is_alive() for t in threads)
+        changes = board.swap_changes()
+        if len(changes) > 0:
+            data = await loop.run_in_executor(executor, encode_changes, changes, board.color_palette.colors)
+            received += len(json.loads(data))
+        if not writing:
+            break
+        await asyncio.sleep(0.005)
+    executor.shutdown()
+    return received, len(placements)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--changes", type=int, default=100000)
+    parser.add_argument("--writers", type=int, default=4)
+    args = parser.parse_args()
+
+    from board import PixelBoard
+    from config import Config
+
+    palette = Config.load_color_palettes()[0]
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        board = PixelBoard(SIZE, SIZE, palette, None, BenchConfig())
+    finally:
+        sys.stdout = stdout
+    placements = make_placements(args.changes, len(palette.colors))
+
+    print(f"{'mode':>14} {'encode ms':>10} {'max loop lag ms':>16} {'payload KiB':>12}")
+    for name, bench in (("legacy", bench_legacy), ("double buffer", bench_double_buffer)):
+        encode_time, max_lag, size = asyncio.run(bench(board, placements))
+        print(f"{name:>14} {encode_time * 1000:>10.1f} {max_lag * 1000:>16.1f} {size / 1024:>12.0f}")
+
+    received, sent = asyncio.run(check_concurrent_writers(board, placements, args.writers))
+    print(f"Concurrent writers ({args.writers}): {received}/{sent} changes broadcast")
+    assert received == sent, "Changes were lost between swap_changes() calls"
+
+
+if __name__ == "__main__":
+    main()
@@ -4,4 +4,5 @@ _sst = SharedState()
 config = _sst.config
 pixel_board = _sst.board
 db_manager = _sst.db_manager
+profiler = _sst.profiler
 is_volatile_mode = config.is_volatile_mode
@@ -1,9 +1,13 @@
 from functools import lru_cache
 from color_palettes import ColorPalette, Color
+from chunked_board import ChunkedBoard
+from board_stats import BoardStats
+from changes import ChangeBuffer
 from tqdm import tqdm
 from config import Config
 from db_manager import DBManager
 from dataclasses import dataclass, asdict
+import threading
 
 
 @dataclass()
@@ -14,14 +18,26 @@ class Pixel:
 
 
 class PixelBoard:
+    CHANGES_CAPACITY = 65536
+
     def __init__(self, width: int, height: int, color_palette: ColorPalette, db_manager: DBManager, config: Config):
         print(f"[Board] Starting setup")
         self._width: int = width
         self._height: int = height
         self._color_palette: ColorPalette = color_palette
 
-        print(f"[Board] - Generating board, x: {self._width}, y: {self._height}, {self._color_palette.colors[0]}")
-        self._board: list[Pixel] = self.create_board_batched(self._width, self._height, self._color_palette.colors[0])
+        assert len(self._color_palette.colors) <= 256, "Palettes with more than 256 colors are not supported"
+
+        print(f"[Board] - Generating board, x: {self._width}, y: {self._height}, chunk: {config.board_chunk_size}, {self._color_palette.colors[0]}")
+        self._board: ChunkedBoard = ChunkedBoard(self._width, self._height, config.board_chunk_size)
+        self._stats: BoardStats = BoardStats(
+            self._width,
+            self._height,
+            len(self._color_palette.colors),
+            config.stats_tile_size,
+            config.stats_bucket_seconds,
+            config.stats_windows
+        )
 
         if not config.is_volatile_mode:
             pixels = db_manager.get_pixels()
@@ -29,12 +45,17 @@ class PixelBoard:
             for x, y, hex in tqdm(pixels, total=len(pixels)):
                 color = int.from_bytes(hex, byteorder='big')
                 color_id = self.get_color_id(color)
-                self._board[y * self._width + x].color = self._color_palette.colors[color_id]
+                self._stats.recolor(self._board.set(x, y, color_id), color_id)
         else:
             print(f"[Board] - Volatile mode, skipping DB sync (DBManager failed?)")
 
         print(f"[Board] - Done!")
-        self._board_changes: list[Pixel] = []
+        # Двойной буфер изменений: в _board_changes пишет set_pixel,
+        # _retired_changes отдаётся на кодирование после swap_changes().
+        # Лок также защищает _board и _stats
+        self._changes_lock = threading.Lock()
+        self._board_changes: ChangeBuffer = ChangeBuffer(self.CHANGES_CAPACITY)
+        self._retired_changes: ChangeBuffer = ChangeBuffer(self.CHANGES_CAPACITY)
         print(f"[Board] Ready")
 
     @property
@@ -49,19 +70,40 @@ class PixelBoard:
     def color_palette(self) -> ColorPalette:
         return self._color_palette
 
+    @property
+    def stat_windows(self) -> list[int]:
+        return self._stats.windows
+
 
-    @lru_cache(maxsize=128)
     def get_pixel_range(self, x: int, y: int, x_end: int, y_end: int, asdictionary: bool = False) -> list[Pixel]:
+        colors = self._color_palette.colors
+        color_dicts = [asdict(c) for c in colors]
+        ids = self._board.get_range(x, y, x_end, y_end)
         pixels: list[Pixel] = []
+        k = 0
         for i in range(x, x_end):
             for j in range(y, y_end):
                 if asdictionary:
-                    pixels.append(asdict(self._board[(j) * self.width + (i)]))
+                    pixels.append({"x": i, "y": j, "color": color_dicts[ids[k]]})
                 else:
-                    pixels.append(self._board[(j) * self.width + (i)])
+                    pixels.append(Pixel(x=i, y=j, color=colors[ids[k]]))
+                k += 1
 
         return pixels
 
+    def get_stats(self, window: int, resolution: int) -> dict:
+        # Чтение статистики сдвигает корзины, поэтому идёт под тем же локом, что и set_pixel
+        with self._changes_lock:
+            summary = self._stats.get_summary()
+            tile_counts = self._stats.copy_tile_counts(window)
+        return {
+            **summary,
+            "heatmap": self._stats.get_heatmap(tile_counts, window, resolution)
+        }
+
+    def get_chunk_stats(self) -> dict:
+        return self._board.get_stats()
+
     @lru_cache(maxsize=20)
     def get_color(self, col_id: int) -> Color:
         try:
@@ -77,30 +119,21 @@ class PixelBoard:
         return 0
 
     def set_pixel(self, x: int, y: int, color_id: int):
-        i = y * self.width + x
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            raise ValueError(f"Pixel ({x}, {y}) is outside of the board")
+
         color = self.get_color(color_id)
-        self._board[i].color = color
-        self._board_changes.append(Pixel(x=x, y=y, color=color))
-
-    def get_changes(self) -> list[Pixel]:
-        return self._board_changes
-
-    def clear_changes(self):
-        self._board_changes = []
-
-    @staticmethod
-    def create_board_batched(width, height, color, batch_size=125000):
-        total_pixels = width * height
-        board = []
-
-        with tqdm(total=total_pixels) as pbar:
-            for start in range(0, total_pixels, batch_size):
-                end = min(start + batch_size, total_pixels)
-                batch = [
-                    Pixel(x=i % width, y=i // width, color=color)  # Fixed
-                    for i in range(start, end)
-                ]
-                board.extend(batch)
-                pbar.update(end - start)
-
-        return board
+        with self._changes_lock:
+            previous_id = self._board.set(x, y, color.color_id)
+            self._stats.record(x, y, color.color_id, previous_id)
+            self._board_changes.append(x, y, color.color_id)
+
+    # Возвращает накопленные изменения и начинает запись в другой буфер.
+    # Возвращённый буфер остаётся валидным до следующего вызова swap_changes()
+    def swap_changes(self) -> ChangeBuffer:
+        with self._changes_lock:
+            retired = self._board_changes
+            self._retired_changes.clear()
+            self._board_changes = self._retired_changes
+            self._retired_changes = retired
+        return retired
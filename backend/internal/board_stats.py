@@ -0,0 +1,218 @@
+from array import array
+from operator import add
+import numpy as np
+import time
+
+
+# Счётчики активности, обновляемые за O(1) на каждое закрашивание.
+# Доска делится на тайлы tile_size x tile_size, время - на корзины по bucket_seconds.
+# Для каждого окна из windows хранится сумма завершённых корзин по тайлам, она пересчитывается
+# при смене корзины, так что на горячем пути увеличивается только текущая корзина.
+# Каждая корзина помнит, какие тайлы в неё попали, поэтому смена корзины обходит только их,
+# а плотно заполненные корзины складываются через numpy. Пустые корзины после простоя ничего не стоят,
+# после долгого простоя сумма окна пересобирается один раз вместо прохода по всем пропущенным корзинам.
+# Класс не потокобезопасен: record(), get_summary() и copy_tile_counts() вызываются под одним локом
+# (см. PixelBoard), т.к. чтение тоже сдвигает корзины.
+class BoardStats:
+    PPS_HISTORY = 60  # seconds
+    # Корзина считается плотной, если в ней больше 1/DENSE_RATIO тайлов: тогда её обходит numpy целиком
+    DENSE_RATIO = 64
+
+    def __init__(self, width: int, height: int, colors_count: int, tile_size: int, bucket_seconds: int, windows: list[int]):
+        self._tile_size: int = tile_size
+        self._tiles_x: int = (width + tile_size - 1) // tile_size
+        self._tiles_y: int = (height + tile_size - 1) // tile_size
+        self._bucket_seconds: int = bucket_seconds
+        self._windows: list[int] = sorted(set(windows))
+        # Размер окна в корзинах, текущая (неполная) корзина входит в окно
+        self._window_buckets: list[int] = [max((w + bucket_seconds - 1) // bucket_seconds, 1) for w in self._windows]
+        self._buckets_count: int = max(self._window_buckets)
+
+        tiles = self._tiles_x * self._tiles_y
+        self._zero_tiles = array("I", bytes(4 * tiles))
+        self._buckets: list[array] = [array("I", self._zero_tiles) for _ in range(self._buckets_count)]
+        self._touched: list[array] = [array("I") for _ in range(self._buckets_count)]
+        # numpy-представления тех же массивов для векторной смены корзин,
+        # на горячем пути остаются обычные array: скалярный доступ к ним быстрее
+        self._bucket_views: list[np.ndarray] = [np.frombuffer(b, dtype=np.uint32) for b in self._buckets]
+        # Суммы по завершённым корзинам окна, без текущей
+        self._window_counts: list[array] = [array("I", self._zero_tiles) for _ in self._windows]
+        self._window_views: list[np.ndarray] = [np.frombuffer(c, dtype=np.uint32) for c in self._window_counts]
+        self._tile_totals = array("Q", bytes(8 * tiles))
+
+        self._color_placements = array("Q", bytes(8 * colors_count))
+        self._color_current = array("Q", bytes(8 * colors_count))
+        self._color_current[0] = width * height
+
+        self._per_second = array("I", bytes(4 * self.PPS_HISTORY))
+        self._total: int = 0
+
+        now = time.monotonic()
+        self._epoch: int = int(now // bucket_seconds)
+        self._second: int = int(now)
+        self._current_bucket: array = self._buckets[self._epoch % self._buckets_count]
+        self._current_touched: array = self._touched[self._epoch % self._buckets_count]
+
+    @property
+    def windows(self) -> list[int]:
+        return self._windows
+
+    def record(self, x: int, y: int, color_id: int, previous_id: int):
+        now = time.monotonic()
+        if now >= self._second + 1:
+            self._advance(now)
+
+        tile_size = self._tile_size
+        tile = (y // tile_size) * self._tiles_x + (x // tile_size)
+        bucket = self._current_bucket
+        if bucket[tile] == 0:
+            self._current_touched.append(tile)
+        bucket[tile] += 1
+        self._tile_totals[tile] += 1
+
+        self._per_second[self._second % self.PPS_HISTORY] += 1
+        self._total += 1
+
+        self._color_placements[color_id] += 1
+        if previous_id != color_id:
+            self._color_current[previous_id] -= 1
+            self._color_current[color_id] += 1
+
+    def recolor(self, previous_id: int, color_id: int):
+        if previous_id != color_id:
+            self._color_current[previous_id] -= 1
+            self._color_current[color_id] += 1
+
+    # window == 0 - за всё время. Возвращает копии, которые можно обрабатывать без лока
+    def copy_tile_counts(self, window: int) -> list[array]:
+        self._advance(time.monotonic())
+        if window == 0:
+            return [array("Q", self._tile_totals)]
+        return [array("I", self._window_counts[self._windows.index(window)]), array("I", self._current_bucket)]
+
+    # Сворачивает тайлы в сетку не больше resolution x resolution
+    def get_heatmap(self, tile_counts: list[array], window: int, resolution: int) -> dict:
+        counts = list(map(add, *tile_counts)) if len(tile_counts) > 1 else tile_counts[0].tolist()
+        factor = max(-(-self._tiles_x // resolution), -(-self._tiles_y // resolution), 1)
+        cells_x = -(-self._tiles_x // factor)
+        cells_y = -(-self._tiles_y // factor)
+
+        if factor == 1:
+            cells = counts
+        else:
+            cells = [0] * (cells_x * cells_y)
+            for ty in range(self._tiles_y):
+                row = (ty // factor) * cells_x
+                tiles_row = counts[ty * self._tiles_x:(ty + 1) * self._tiles_x]
+                for tx, count in enumerate(tiles_row):
+                    cells[row + tx // factor] += count
+
+        return {
+            "tile_size": self._tile_size * factor,
+            "tiles_x": cells_x,
+            "tiles_y": cells_y,
+            "window": window,
+            "counts": cells,
+        }
+
+    def get_summary(self) -> dict:
+        self._advance(time.monotonic())
+        current = self._second % self.PPS_HISTORY
+        completed = sum(self._per_second) - self._per_second[current]
+        return {
+            "total_placements": self._total,
+            "placements_last_second": self._per_second[(current - 1) % self.PPS_HISTORY],
+            "placements_per_second": completed / (self.PPS_HISTORY - 1),
+            "color_placements": self._color_placements.tolist(),
+            "color_pixels": self._color_current.tolist(),
+        }
+
+    def _advance(self, now: float):
+        second = int(now)
+        if second != self._second:
+            steps = min(second - self._second, self.PPS_HISTORY)
+            for s in range(self._second + 1, self._second + 1 + steps):
+                self._per_second[s % self.PPS_HISTORY] = 0
+            self._second = second
+
+        epoch = int(now // self._bucket_seconds)
+        if epoch == self._epoch:
+            return
+
+        if epoch - self._epoch >= self._buckets_count:
+            for i in range(self._buckets_count):
+                self._clear_bucket(i)
+            for counts in self._window_views:
+                counts[:] = 0
+        else:
+            # Для каждого окна выбираем, что дешевле: пройти пропущенные корзины по одной
+            # или пересобрать сумму из корзин, оставшихся в окне (выгодно после простоя)
+            stepped = []
+            for window, size in enumerate(self._window_buckets):
+                if self._step_cost(epoch, size) <= self._rebuild_cost(epoch, size):
+                    stepped.append((window, size))
+                else:
+                    self._window_views[window][:] = 0
+                    for e in range(max(epoch - size + 1, self._epoch - self._buckets_count + 1), self._epoch + 1):
+                        self._add_bucket(window, e % self._buckets_count)
+
+            for e in range(self._epoch + 1, epoch + 1):
+                # Корзина e - 1 завершилась и входит в окно, корзина e - size из окна выпадает
+                finished = (e - 1) % self._buckets_count
+                for window, size in stepped:
+                    expired = (e - size) % self._buckets_count
+                    if finished != expired:
+                        self._add_bucket(window, finished)
+                        self._sub_bucket(window, expired)
+                self._clear_bucket(e % self._buckets_count)
+        self._epoch = epoch
+        self._current_bucket = self._buckets[epoch % self._buckets_count]
+        self._current_touched = self._touched[epoch % self._buckets_count]
+
+    # Оценка стоимости обхода корзины в тайлах; плотную корзину numpy обходит за ~tiles / DENSE_RATIO
+    def _bucket_cost(self, e: int) -> int:
+        if e > self._epoch:
+            return 0
+        return min(len(self._touched[e % self._buckets_count]), len(self._zero_tiles) // self.DENSE_RATIO)
+
+    def _step_cost(self, epoch: int, size: int) -> int:
+        return sum(
+            self._bucket_cost(e - 1) + self._bucket_cost(e - size)
+            for e in range(self._epoch + 1, epoch + 1) if size > 1
+        )
+
+    def _rebuild_cost(self, epoch: int, size: int) -> int:
+        return len(self._zero_tiles) // self.DENSE_RATIO + sum(
+            self._bucket_cost(e)
+            for e in range(max(epoch - size + 1, self._epoch - self._buckets_count + 1), self._epoch + 1)
+        )
+
+    def _is_dense(self, index: int) -> bool:
+        return len(self._touched[index]) * self.DENSE_RATIO > len(self._zero_tiles)
+
+    def _add_bucket(self, window: int, index: int):
+        if self._is_dense(index):
+            self._window_views[window] += self._bucket_views[index]
+        else:
+            counts = self._window_counts[window]
+            bucket = self._buckets[index]
+            for tile in self._touched[index]:
+                counts[tile] += bucket[tile]
+
+    def _sub_bucket(self, window: int, index: int):
+        if self._is_dense(index):
+            self._window_views[window] -= self._bucket_views[index]
+        else:
+            counts = self._window_counts[window]
+            bucket = self._buckets[index]
+            for tile in self._touched[index]:
+                counts[tile] -= bucket[tile]
+
+    def _clear_bucket(self, index: int):
+        if self._is_dense(index):
+            self._bucket_views[index][:] = 0
+        else:
+            bucket = self._buckets[index]
+            for tile in self._touched[index]:
+                bucket[tile] = 0
+        del self._touched[index][:]
@@ -0,0 +1,39 @@
+from array import array
+from color_palettes import Color
+
+
+# Буфер изменений доски. Каждое изменение упаковано в одно 64-битное число:
+# x - старшие 32 бита, y - следующие 24, ID цвета - младшие 8.
+# Память выделяется заранее и переиспользуется после clear().
+class ChangeBuffer:
+    def __init__(self, capacity: int):
+        self._data = array("Q", bytes(8 * max(capacity, 1)))
+        self._size: int = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, x: int, y: int, color_id: int):
+        if self._size == len(self._data):
+            self._data.extend(self._data)
+        self._data[self._size] = (x << 32) | (y << 8) | color_id
+        self._size += 1
+
+    def clear(self):
+        self._size = 0
+
+    def __iter__(self):
+        data = self._data
+        for i in range(self._size):
+            value = data[i]
+            yield value >> 32, (value >> 8) & 0xFFFFFF, value & 0xFF
+
+
+# Формат совпадает с json.dumps(list[Pixel], cls=EnhancedJSONEncoder),
+# но без промежуточных dict, поэтому кодирование в несколько раз быстрее
+def encode_changes(changes: ChangeBuffer, colors: list[Color]) -> str:
+    color_json = [f'{{"hex": {c.hex}, "color_id": {c.color_id}}}' for c in colors]
+    return "[" + ", ".join([
+        f'{{"x": {x}, "y": {y}, "color": {color_json[color_id]}}}'
+        for x, y, color_id in changes
+    ]) + "]"
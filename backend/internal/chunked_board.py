@@ -0,0 +1,90 @@
+DEFAULT_COLOR_ID = 0
+
+
+# Доска, поделённая на квадратные чанки chunk_size x chunk_size.
+# Чанк выделяется при первой записи, до этого все его пиксели имеют цвет DEFAULT_COLOR_ID.
+# Внутри чанка хранится по одному байту (ID цвета в палитре) на пиксель.
+class ChunkedBoard:
+    def __init__(self, width: int, height: int, chunk_size: int):
+        self._width: int = width
+        self._height: int = height
+        self._chunk_size: int = chunk_size
+        self._chunks_x: int = (width + chunk_size - 1) // chunk_size
+        self._chunks_y: int = (height + chunk_size - 1) // chunk_size
+
+        self._chunks: list[bytearray | None] = [None] * (self._chunks_x * self._chunks_y)
+        # Количество пикселей чанка, цвет которых отличается от DEFAULT_COLOR_ID
+        self._occupancy: list[int] = [0] * (self._chunks_x * self._chunks_y)
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    @property
+    def chunks_x(self) -> int:
+        return self._chunks_x
+
+    @property
+    def chunks_y(self) -> int:
+        return self._chunks_y
+
+    def get(self, x: int, y: int) -> int:
+        size = self._chunk_size
+        chunk = self._chunks[(y // size) * self._chunks_x + (x // size)]
+        if chunk is None:
+            return DEFAULT_COLOR_ID
+        return chunk[(y % size) * size + (x % size)]
+
+    def set(self, x: int, y: int, color_id: int) -> int:
+        size = self._chunk_size
+        chunk_index = (y // size) * self._chunks_x + (x // size)
+        chunk = self._chunks[chunk_index]
+        if chunk is None:
+            if color_id == DEFAULT_COLOR_ID:
+                return DEFAULT_COLOR_ID
+            chunk = bytearray(size * size)
+            self._chunks[chunk_index] = chunk
+
+        i = (y % size) * size + (x % size)
+        previous = chunk[i]
+        chunk[i] = color_id
+        if previous == DEFAULT_COLOR_ID and color_id != DEFAULT_COLOR_ID:
+            self._occupancy[chunk_index] += 1
+        elif previous != DEFAULT_COLOR_ID and color_id == DEFAULT_COLOR_ID:
+            self._occupancy[chunk_index] -= 1
+        return previous
+
+    def get_range(self, x: int, y: int, x_end: int, y_end: int) -> list[int]:
+        # Порядок обхода совпадает с PixelBoard.get_pixel_range: сначала по y, затем по x
+        size = self._chunk_size
+        chunks = self._chunks
+        chunks_x = self._chunks_x
+        ids: list[int] = []
+        for i in range(x, x_end):
+            chunk_column = i // size
+            local_x = i % size
+            for j in range(y, y_end):
+                chunk = chunks[(j // size) * chunks_x + chunk_column]
+                if chunk is None:
+                    ids.append(DEFAULT_COLOR_ID)
+                else:
+                    ids.append(chunk[(j % size) * size + local_x])
+        return ids
+
+    def get_stats(self) -> dict:
+        allocated = [
+            {
+                "x": index % self._chunks_x,
+                "y": index // self._chunks_x,
+                "occupied": self._occupancy[index],
+                "occupancy": self._occupancy[index] / (self._chunk_size * self._chunk_size),
+            }
+            for index, chunk in enumerate(self._chunks) if chunk is not None
+        ]
+        return {
+            "chunk_size": self._chunk_size,
+            "chunks_total": len(self._chunks),
+            "chunks_allocated": len(allocated),
+            "allocated_bytes": len(allocated) * self._chunk_size * self._chunk_size,
+            "chunks": allocated,
+        }
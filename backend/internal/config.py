@@ -19,6 +19,7 @@ class Config:
         print("[Config] - Done!")
         self._board_width: int = int(config["PIXELBOARD"]["width"])
         self._board_height: int = int(config["PIXELBOARD"]["height"])
+        self._board_chunk_size: int = max(int(config["PIXELBOARD"].get("chunk_size", 256)), 1)
         print(f"[Config] Board width: {self._board_width}, {self._board_height}")
 
         print("[Config] Loading color palettes..")
@@ -65,6 +66,25 @@ class Config:
             self._clear_current = config["SNAPSHOT"].getboolean("clear_current", False)
             self._clear_snapshots = config["SNAPSHOT"].getboolean("clear_snapshots", False)
 
+        stats = config["STATS"] if config.has_section("STATS") else {}
+        self._stats_tile_size: int = max(int(stats.get("tile_size", 64)), 1)
+        self._stats_bucket_seconds: int = max(int(stats.get("bucket_seconds", 60)), 1)
+        self._stats_windows: list[int] = [
+            int(w) for w in stats.get("windows", "60, 600, 3600").split(",") if int(w) > 0
+        ] or [600]
+
+        # Админские эндпоинты доступны только с этим токеном, пустой токен их отключает
+        admin = config["ADMIN"] if config.has_section("ADMIN") else {}
+        self._admin_token: str = admin.get("token", "").strip()
+        if not self._admin_token:
+            print(f"[Config] {Fore.YELLOW}|::| Admin token is not set, admin endpoints are disabled")
+
+        profiling = config["PROFILING"] if config.has_section("PROFILING") else {}
+        self._profile_output_dir: str = profiling.get("output_dir", "profiles")
+        self._profile_sample_interval: float = float(profiling.get("sample_interval", 0.005))
+        self._profile_max_duration: int = int(profiling.get("max_duration", 300))
+        self._profile_top_allocations: int = int(profiling.get("top_allocations", 50))
+
         print(f"[Config] Ready")
 
     @property
@@ -79,6 +99,10 @@ class Config:
     def board_height(self) -> int:
         return self._board_height
 
+    @property
+    def board_chunk_size(self) -> int:
+        return self._board_chunk_size
+
     @property
     def color_palette_id(self) -> int:
         return self._color_palette_id
@@ -129,6 +153,38 @@ class Config:
     def clear_db_snapshots(self) -> bool:
         return self._clear_snapshots
 
+    @property
+    def stats_tile_size(self) -> int:
+        return self._stats_tile_size
+
+    @property
+    def stats_bucket_seconds(self) -> int:
+        return self._stats_bucket_seconds
+
+    @property
+    def stats_windows(self) -> list[int]:
+        return self._stats_windows
+
+    @property
+    def admin_token(self) -> str:
+        return self._admin_token
+
+    @property
+    def profile_output_dir(self) -> str:
+        return self._profile_output_dir
+
+    @property
+    def profile_sample_interval(self) -> float:
+        return self._profile_sample_interval
+
+    @property
+    def profile_max_duration(self) -> int:
+        return self._profile_max_duration
+
+    @property
+    def profile_top_allocations(self) -> int:
+        return self._profile_top_allocations
+
     def set_volatile_mode(self):
         self._db_enabled = False
 
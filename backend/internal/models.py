@@ -26,3 +26,21 @@ class ColorPixelRequestModel(BasePixelPos):
 class SettingsResponse(BaseModel):
     board_size: BasePixelPos
     palette: ColorPalette
+
+class HeatmapResponse(BaseModel):
+    tile_size: int
+    tiles_x: int
+    tiles_y: int
+    window: int
+    counts: list[int]
+
+class StatsResponse(BaseModel):
+    total_placements: int
+    placements_last_second: int
+    placements_per_second: float
+    color_placements: list[int]
+    color_pixels: list[int]
+    heatmap: HeatmapResponse
+
+class ProfileRequestModel(BaseModel):
+    duration: int = 30
@@ -0,0 +1,154 @@
+from collections import Counter
+import datetime
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from colorama import Fore, Back, Style, init
+init(autoreset=True)
+
+
+# Точки ожидания (файл, функция): стек, который заканчивается на них, - простой потока, а не работа CPU.
+# select/poll/epoll вызываются из selectors.py, Condition.wait и Event.wait сводятся к threading.wait,
+# queue.get ждёт через Condition, пустой ThreadPoolExecutor висит в _worker на SimpleQueue.get
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+# Семплирующий профайлер: пока он выключен, горячие пути не трогаются вообще,
+# поэтому его можно держать включённым в прод-сборке.
+# Стеки простаивающих потоков пишутся под отдельным корнем "idle", чтобы не заслонять работу CPU.
+class Profiler:
+    def __init__(self, output_dir: str, sample_interval: float, max_duration: int, top_allocations: int):
+        self._output_dir: str = output_dir
+        self._sample_interval: float = sample_interval
+        self._max_duration: int = max_duration
+        self._top_allocations: int = top_allocations
+
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._stacks: Counter[str] = Counter()
+        self._samples: int = 0
+        self._started_at: float = 0.0
+        self._deadline: float = 0.0
+        self._last_output: list[str] = []
+        # Не останавливаем tracemalloc, если его включили до нас (например, PYTHONTRACEMALLOC)
+        self._owns_tracing: bool = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def max_duration(self) -> int:
+        return self._max_duration
+
+    @property
+    def last_output(self) -> list[str]:
+        return self._last_output
+
+    def status(self) -> dict:
+        return {
+            "running": self.is_running,
+            "samples": self._samples,
+            "remaining": max(self._deadline - time.monotonic(), 0.0) if self.is_running else 0.0,
+            "last_output": self._last_output,
+        }
+
+    def start(self, duration: float) -> bool:
+        with self._lock:
+            if self.is_running:
+                return False
+
+            duration = min(max(duration, 1.0), self._max_duration)
+            self._stacks = Counter()
+            self._samples = 0
+            self._stop_event.clear()
+            self._started_at = time.monotonic()
+            self._deadline = self._started_at + duration
+
+            # Отчёт строится по строке выделения, поэтому хватает одного кадра
+            self._owns_tracing = not tracemalloc.is_tracing()
+            if self._owns_tracing:
+                tracemalloc.start(1)
+
+            self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+            self._thread.start()
+            print(f"[Profiler] Started for {duration:.0f}s (interval: {self._sample_interval * 1000:.1f}ms)")
+            return True
+
+    def stop(self):
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        try:
+            while not self._stop_event.wait(self._sample_interval):
+                if time.monotonic() >= self._deadline:
+                    break
+                self._sample(own_ident)
+        except Exception as e:
+            print(f"[Profiler] {Fore.YELLOW}|::| Sampling failed: {e}")
+        finally:
+            self._dump()
+
+    def _sample(self, own_ident: int):
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+
+            leaf = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+            stack: list[str] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.append(thread_names.get(ident, str(ident)))
+            if leaf in IDLE_FRAMES:
+                stack.append("idle")
+            stack.reverse()
+
+            self._stacks[";".join(stack)] += 1
+        self._samples += 1
+
+    def _dump(self):
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+        os.makedirs(self._output_dir, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        folded_path = os.path.join(self._output_dir, f"cpu_{stamp}.folded")
+        alloc_path = os.path.join(self._output_dir, f"alloc_{stamp}.txt")
+
+        # Формат "collapsed stacks": совместим с flamegraph.pl, speedscope и inferno
+        with open(folded_path, "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        with open(alloc_path, "w", encoding="utf-8") as f:
+            elapsed = time.monotonic() - self._started_at
+            f.write(f"Window: {elapsed:.1f}s, samples: {self._samples}\n")
+            if snapshot is not None:
+                snapshot = snapshot.filter_traces((
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                    tracemalloc.Filter(False, "<unknown>"),
+                ))
+                for i, stat in enumerate(snapshot.statistics("lineno")[:self._top_allocations]):
+                    f.write(f"#{i + 1}: {stat.traceback[0]} size={stat.size / 1024:.1f} KiB count={stat.count}\n")
+
+        self._last_output = [folded_path, alloc_path]
+        print(f"[Profiler] Done, {self._samples} samples written to '{folded_path}', allocations to '{alloc_path}'")
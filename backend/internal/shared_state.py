@@ -1,4 +1,4 @@
-from internal import board, config, db_manager
+from internal import board, config, db_manager, profiler
 from colorama import Fore, Back, Style, init
 init(autoreset=True)
 
@@ -31,4 +31,10 @@ class SharedState:
         else:
             self.db_manager = None
         self.board = board.PixelBoard(self.config.board_width, self.config.board_height, self.config.palettes[self.config.color_palette_id], self.db_manager, self.config)
+        self.profiler = profiler.Profiler(
+            self.config.profile_output_dir,
+            self.config.profile_sample_interval,
+            self.config.profile_max_duration,
+            self.config.profile_top_allocations
+        )
         print(f"[SharedState] Ready")
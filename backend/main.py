@@ -1,5 +1,7 @@
 from sys import path as syspath
 import argparse
+import os
+import time
 
 syspath.append("../backend/internal")
 syspath.append("../backend/routers")
@@ -7,6 +9,7 @@ syspath.append("../backend/routers")
 import routers.router_board as router_board
 import routers.router_broadcast as router_broadcast
 import routers.router_site as router_site
+import routers.router_admin as router_admin
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
@@ -18,7 +21,10 @@ from contextlib import asynccontextmanager
 async def lifespan(app: FastAPI):
     await router_broadcast.create_broadcast_task()
     await router_board.create_snapshot_task()
+    router_admin.start_profile_from_env()
     yield
+    await router_broadcast.stop_broadcast_task()
+    router_admin.stop_profile()
 
 server = FastAPI(lifespan=lifespan)
 
@@ -39,6 +45,7 @@ server.add_middleware(
 server.include_router(router_board.router)
 server.include_router(router_broadcast.router)
 server.include_router(router_site.router)
+server.include_router(router_admin.router)
 
 server.mount("/site", StaticFiles(directory="../frontend", html=True), name="front")
 
@@ -48,8 +55,15 @@ if __name__ == "__main__":
     parser.add_argument("--host", type=str)
     parser.add_argument("--port", type=int)
     parser.add_argument("--hotreload", action="store_true")
+    parser.add_argument("--profile", type=int, nargs="?", const=60, metavar="SECONDS",
+                        help="Profile CPU and allocations for the first SECONDS after startup (default: 60). "
+                             "With --hotreload, reloads within the window continue it")
     args = parser.parse_args()
 
+    # uvicorn заново импортирует main:server, поэтому флаг передаём через окружение
+    if args.profile:
+        os.environ[router_admin.PROFILE_ENV] = str(time.time() + args.profile)
+
     default_host = "127.0.0.1"
     default_port = 8080
 
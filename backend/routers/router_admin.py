@@ -0,0 +1,72 @@
+from fastapi import APIRouter, HTTPException, Request
+from dependencies import profiler, pixel_board, config
+from internal.models import ProfileRequestModel
+from colorama import Fore, init
+import hmac
+import os
+import time
+init(autoreset=True)
+
+
+PROFILE_ENV = "PIXELBOARD_PROFILE"
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"]
+)
+
+# В PROFILE_ENV лежит время окончания окна (time.time()), а не длительность:
+# процесс-наблюдатель uvicorn --reload передаёт переменную каждому перезапуску,
+# и перезапущенный сервер должен профилировать только остаток исходного окна
+def start_profile_from_env():
+    deadline = os.environ.pop(PROFILE_ENV, None)
+    if not deadline:
+        return
+
+    try:
+        remaining = float(deadline) - time.time()
+    except ValueError:
+        print(f"[Profiler] {Fore.YELLOW}|::| Ignoring malformed {PROFILE_ENV}={deadline!r}")
+        return
+
+    if remaining >= 1:
+        profiler.start(remaining)
+
+def stop_profile():
+    if profiler.is_running:
+        profiler.stop()
+
+def check_admin(request: Request):
+    if not config.admin_token:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled")
+
+    token = request.headers.get(ADMIN_TOKEN_HEADER, "")
+    if not hmac.compare_digest(token.encode(), config.admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@router.get("/profile")
+def get_profile_status(request: Request):
+    check_admin(request)
+    return profiler.status()
+
+@router.post("/profile")
+def start_profile(req: ProfileRequestModel, request: Request):
+    check_admin(request)
+    if req.duration <= 0 or req.duration > profiler.max_duration:
+        raise HTTPException(status_code=400, detail=f"Duration must be in range 1..{profiler.max_duration} seconds")
+
+    if not profiler.start(req.duration):
+        raise HTTPException(status_code=409, detail="Profiling is already running")
+    return profiler.status()
+
+@router.delete("/profile")
+def stop_profile_now(request: Request):
+    check_admin(request)
+    stop_profile()
+    return profiler.status()
+
+@router.get("/chunks")
+def get_chunk_stats(request: Request):
+    check_admin(request)
+    return pixel_board.get_chunk_stats()
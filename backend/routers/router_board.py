@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from dependencies import pixel_board, config, db_manager
-from internal.models import SettingsResponse, ColorPixelRequestModel, PixelBoardResponse
+from internal.models import SettingsResponse, ColorPixelRequestModel, PixelBoardResponse, StatsResponse
 from internal.jsonenchanced import EnhancedJSONEncoder
 import datetime
 import asyncio
 
 
+MAX_HEATMAP_RESOLUTION = 256
+
 snapshot_task = None
 async def create_snapshot_task():
     global snapshot_task
@@ -39,7 +41,7 @@ def get_board_size():
 
 @router.post("/ColorPixel")
 async def set_pixel(req: ColorPixelRequestModel):
-    if (req.x - config.board_width >= 0) or (req.y - config.board_height >= 0):
+    if (req.x < 0) or (req.y < 0) or (req.x - config.board_width >= 0) or (req.y - config.board_height >= 0):
         raise HTTPException(status_code=400, detail="Invalid pixel position")
 
     if (req.color >= len(pixel_board.color_palette.colors)):
@@ -66,3 +68,13 @@ def get_pixels(x: int, y: int, x_end: int, y_end: int):
     return {
         "pixels": pixels
     }
+
+@router.get("/stats", response_model=StatsResponse)
+def get_stats(window: int = 600, resolution: int = 64):
+    if window != 0 and window not in pixel_board.stat_windows:
+        raise HTTPException(status_code=400, detail=f"Invalid window, available: 0 (all time), {pixel_board.stat_windows}")
+
+    if resolution < 1 or resolution > MAX_HEATMAP_RESOLUTION:
+        raise HTTPException(status_code=400, detail=f"Invalid resolution, must be in range 1..{MAX_HEATMAP_RESOLUTION}")
+
+    return pixel_board.get_stats(window, resolution)
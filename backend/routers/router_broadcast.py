@@ -1,12 +1,12 @@
 from multiprocessing import Event
 from fastapi import APIRouter, Request, Response
-from internal.jsonenchanced import EnhancedJSONEncoder
+from internal.changes import encode_changes
 from dependencies import pixel_board
 from sse_starlette.sse import EventSourceResponse
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
 import uuid
-import json
 
 
 STREAM_DELAY = 0.5  # second
@@ -19,10 +19,18 @@ router = APIRouter(
 
 
 broadcast_task = None
+# Кодирование изменений в JSON выполняется вне event loop
+encode_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="broadcast-encoder")
+
 async def create_broadcast_task():
     global broadcast_task
     broadcast_task = asyncio.create_task(periodic_broadcast())
 
+async def stop_broadcast_task():
+    if broadcast_task is not None:
+        broadcast_task.cancel()
+    encode_executor.shutdown(wait=False, cancel_futures=True)
+
 event_queues = defaultdict(set)
 
 async def broadcast_to_all(data):
@@ -71,18 +79,16 @@ async def message_stream(request: Request, response: Response):
     return EventSourceResponse(event_generator())
 
 async def periodic_broadcast():
-    def new_messages():
-        changes = pixel_board.get_changes()
-        if len(changes) > 0:
-            pixel_board.clear_changes()
-            return len(changes) > 0, json.dumps(changes, cls=EnhancedJSONEncoder)
-        return False, ""
+    loop = asyncio.get_running_loop()
+    colors = pixel_board.color_palette.colors
 
     while True:
         try:
             await asyncio.sleep(STREAM_DELAY)
-            has_changes, new_data = new_messages()
-            if has_changes:
+            # Буфер не переиспользуется до следующего swap_changes(), т.е. до конца кодирования
+            changes = pixel_board.swap_changes()
+            if len(changes) > 0:
+                new_data = await loop.run_in_executor(encode_executor, encode_changes, changes, colors)
                 await broadcast_to_all(new_data)
         except asyncio.CancelledError:
             break
@@ -0,0 +1,7 @@
+from sys import path as syspath
+import os
+
+# Тот же sys.path, что и в main.py: модули internal импортируются и как internal.x, и как x
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+syspath.append(BACKEND_DIR)
+syspath.append(os.path.join(BACKEND_DIR, "internal"))
@@ -0,0 +1,175 @@
+import random
+
+import pytest
+
+import board_stats
+from board_stats import BoardStats
+
+
+WIDTH = 100
+HEIGHT = 70
+TILE = 10
+BUCKET = 10
+WINDOWS = [10, 30, 100]
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# 1 - все корзины обходятся по спискам тайлов, 10**9 - всегда через numpy
+@pytest.fixture(params=[1, 10**9], ids=["sparse", "dense"])
+def rollover_mode(request, monkeypatch):
+    monkeypatch.setattr(BoardStats, "DENSE_RATIO", request.param)
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(board_stats.time, "monotonic", fake)
+    return fake
+
+
+def make_stats(colors: int = 4) -> BoardStats:
+    return BoardStats(WIDTH, HEIGHT, colors, TILE, BUCKET, WINDOWS)
+
+
+def expected_window(log, now: float, window: int) -> list[int]:
+    # Окно включает текущую корзину и size - 1 предыдущих
+    size = -(-window // BUCKET)
+    epoch = int(now // BUCKET)
+    tiles_x = -(-WIDTH // TILE)
+    counts = [0] * (tiles_x * -(-HEIGHT // TILE))
+    for t, x, y in log:
+        if int(t // BUCKET) > epoch - size:
+            counts[(y // TILE) * tiles_x + x // TILE] += 1
+    return counts
+
+
+def heatmap(stats: BoardStats, window: int) -> list[int]:
+    return stats.get_heatmap(stats.copy_tile_counts(window), window, 256)["counts"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_window_counts_match_brute_force(clock, rollover_mode, seed):
+    rng = random.Random(seed)
+    stats = make_stats()
+    log = []
+    for step in range(3000):
+        # В основном мелкие шаги, иногда простой на несколько корзин или дольше всех окон
+        roll = rng.random()
+        if roll < 0.01:
+            clock.now += rng.uniform(BUCKET * 2, BUCKET * 15)
+        elif roll < 0.02:
+            clock.now += rng.uniform(100, 300)
+        else:
+            clock.now += rng.random() * 0.5
+
+        x, y = rng.randrange(WIDTH), rng.randrange(HEIGHT)
+        stats.record(x, y, 0, 0)
+        log.append((clock.now, x, y))
+
+        if step % 50 == 0:
+            for window in WINDOWS:
+                assert heatmap(stats, window) == expected_window(log, clock.now, window)
+
+    tiles_x = -(-WIDTH // TILE)
+    totals = [0] * len(heatmap(stats, 0))
+    for _, x, y in log:
+        totals[(y // TILE) * tiles_x + x // TILE] += 1
+    assert heatmap(stats, 0) == totals
+
+
+def test_dense_buckets_roll_over_correctly(clock, rollover_mode):
+    stats = make_stats()
+    log = []
+    for bucket in range(15):
+        for y in range(HEIGHT):
+            for x in range(0, WIDTH, 3):
+                stats.record(x, y, 0, 0)
+                log.append((clock.now, x, y))
+        clock.now += BUCKET
+        for window in WINDOWS:
+            assert heatmap(stats, window) == expected_window(log, clock.now, window)
+
+
+def test_readers_see_rollover_without_placements(clock, rollover_mode):
+    stats = make_stats()
+    stats.record(5, 5, 0, 0)
+    assert sum(heatmap(stats, 10)) == 1
+
+    clock.now += BUCKET
+    assert sum(heatmap(stats, 10)) == 0
+    assert sum(heatmap(stats, 30)) == 1
+
+    clock.now += 1000
+    assert all(sum(heatmap(stats, window)) == 0 for window in WINDOWS)
+    assert sum(heatmap(stats, 0)) == 1
+
+
+def test_per_second_ring(clock):
+    clock.now = 1000.0
+    stats = make_stats()
+    for _ in range(5):
+        stats.record(0, 0, 0, 0)
+    clock.now = 1001.5
+    for _ in range(3):
+        stats.record(0, 0, 0, 0)
+
+    clock.now = 1002.1
+    summary = stats.get_summary()
+    assert summary["total_placements"] == 8
+    assert summary["placements_last_second"] == 3
+    assert summary["placements_per_second"] == pytest.approx(8 / (BoardStats.PPS_HISTORY - 1))
+
+    # Через минуту простоя старые секунды вытесняются из кольца
+    clock.now += BoardStats.PPS_HISTORY + 1
+    summary = stats.get_summary()
+    assert summary["placements_last_second"] == 0
+    assert summary["placements_per_second"] == 0
+    assert summary["total_placements"] == 8
+
+
+def test_color_accounting(clock):
+    stats = make_stats(colors=3)
+    board = {}
+
+    def paint(x, y, color_id):
+        previous_id = board.get((x, y), 0)
+        stats.record(x, y, color_id, previous_id)
+        board[(x, y)] = color_id
+
+    paint(1, 1, 1)
+    paint(1, 1, 2)
+    paint(2, 2, 2)
+    paint(2, 2, 0)
+    paint(3, 3, 1)
+
+    # recolor() - для загрузки из БД: пиксели без учёта в счётчиках закрашиваний
+    stats.recolor(0, 2)
+
+    summary = stats.get_summary()
+    assert summary["color_placements"] == [1, 2, 2]
+    assert summary["color_pixels"] == [WIDTH * HEIGHT - 3, 1, 2]
+    assert sum(summary["color_pixels"]) == WIDTH * HEIGHT
+
+
+def test_heatmap_downsampling(clock):
+    stats = make_stats()
+    rng = random.Random(0)
+    points = [(rng.randrange(WIDTH), rng.randrange(HEIGHT)) for _ in range(500)]
+    for x, y in points:
+        stats.record(x, y, 0, 0)
+
+    result = stats.get_heatmap(stats.copy_tile_counts(10), 10, 3)
+    assert result["tiles_x"] <= 3 and result["tiles_y"] <= 3
+
+    cell = result["tile_size"]
+    expected = [0] * (result["tiles_x"] * result["tiles_y"])
+    for x, y in points:
+        expected[(y // cell) * result["tiles_x"] + x // cell] += 1
+    assert result["counts"] == expected
@@ -0,0 +1,123 @@
+from types import SimpleNamespace
+from collections import Counter
+import json
+import threading
+
+import pytest
+
+from board import PixelBoard, Pixel
+from changes import ChangeBuffer, encode_changes
+from color_palettes import Color, ColorPalette
+from internal.jsonenchanced import EnhancedJSONEncoder
+
+
+PALETTE = ColorPalette(0, [Color(0xFFFFFF, 0), Color(0x000000, 1), Color(0xFF6B6B, 2), Color(0x45B7D1, 3)])
+
+
+def make_board(width: int = 64, height: int = 48) -> PixelBoard:
+    config = SimpleNamespace(
+        is_volatile_mode=True,
+        board_chunk_size=16,
+        stats_tile_size=8,
+        stats_bucket_seconds=60,
+        stats_windows=[60],
+    )
+    return PixelBoard(width, height, PALETTE, None, config)
+
+
+def test_change_buffer_packs_and_unpacks():
+    buffer = ChangeBuffer(4)
+    changes = [(0, 0, 0), (19999, 19999, 255), (5, 7, 3), (2**31, 2**24 - 1, 1)]
+    for change in changes:
+        buffer.append(*change)
+
+    assert len(buffer) == len(changes)
+    assert list(buffer) == changes
+
+
+def test_change_buffer_grows_past_capacity():
+    buffer = ChangeBuffer(2)
+    changes = [(i, i * 2, i % 4) for i in range(1000)]
+    for change in changes:
+        buffer.append(*change)
+
+    assert list(buffer) == changes
+
+
+def test_change_buffer_clear_reuses_memory():
+    buffer = ChangeBuffer(2)
+    for i in range(10):
+        buffer.append(i, i, 1)
+    buffer.clear()
+
+    assert len(buffer) == 0
+    assert list(buffer) == []
+
+    buffer.append(3, 4, 2)
+    assert list(buffer) == [(3, 4, 2)]
+
+
+@pytest.mark.parametrize("changes", [
+    [],
+    [(0, 0, 0)],
+    [(1, 2, 3), (63, 47, 1), (1, 2, 0)],
+])
+def test_encode_changes_matches_enhanced_json_encoder(changes):
+    buffer = ChangeBuffer(1)
+    pixels = []
+    for x, y, color_id in changes:
+        buffer.append(x, y, color_id)
+        pixels.append(Pixel(x=x, y=y, color=PALETTE.colors[color_id]))
+
+    assert encode_changes(buffer, PALETTE.colors) == json.dumps(pixels, cls=EnhancedJSONEncoder)
+
+
+def test_swap_changes_hands_off_and_reuses_buffers():
+    board = make_board()
+    board.set_pixel(1, 2, 3)
+    board.set_pixel(4, 5, 1)
+
+    first = board.swap_changes()
+    assert list(first) == [(1, 2, 3), (4, 5, 1)]
+
+    # Пока буфер не возвращён следующим swap_changes(), новые изменения идут в другой буфер
+    board.set_pixel(6, 7, 2)
+    assert list(first) == [(1, 2, 3), (4, 5, 1)]
+
+    second = board.swap_changes()
+    assert second is not first
+    assert list(second) == [(6, 7, 2)]
+
+    third = board.swap_changes()
+    assert third is first
+    assert len(third) == 0
+
+
+def test_set_pixel_rejects_out_of_board_coordinates():
+    board = make_board()
+    for x, y in [(-1, 0), (0, -1), (64, 0), (0, 48)]:
+        with pytest.raises(ValueError):
+            board.set_pixel(x, y, 1)
+
+    assert len(board.swap_changes()) == 0
+    assert all(pixel.color.color_id == 0 for pixel in board.get_pixel_range(0, 0, 64, 48))
+
+
+def test_swap_changes_loses_nothing_with_concurrent_writers():
+    board = make_board()
+    placements = [(i % 64, (i // 64) % 48, i % 4) for i in range(20000)]
+    writers = [
+        threading.Thread(target=lambda chunk=placements[i::4]: [board.set_pixel(*p) for p in chunk])
+        for i in range(4)
+    ]
+
+    received = []
+    for writer in writers:
+        writer.start()
+    while any(writer.is_alive() for writer in writers):
+        received.extend(json.loads(encode_changes(board.swap_changes(), PALETTE.colors)))
+    for writer in writers:
+        writer.join()
+    received.extend(json.loads(encode_changes(board.swap_changes(), PALETTE.colors)))
+
+    assert Counter((p["x"], p["y"], p["color"]["color_id"]) for p in received) == Counter(placements)
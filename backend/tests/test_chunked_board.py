@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+import random
+
+from board import PixelBoard
+from chunked_board import ChunkedBoard, DEFAULT_COLOR_ID
+from color_palettes import Color, ColorPalette
+
+
+PALETTE = ColorPalette(0, [Color(0xFFFFFF, 0), Color(0x000000, 1), Color(0xFF6B6B, 2), Color(0x45B7D1, 3)])
+
+# Размеры не кратны размеру чанка, чтобы последний чанк в строке и столбце был неполным
+WIDTH = 37
+HEIGHT = 23
+CHUNK = 8
+
+
+def test_unwritten_board_reads_default_color():
+    board = ChunkedBoard(WIDTH, HEIGHT, CHUNK)
+    assert board.get(0, 0) == DEFAULT_COLOR_ID
+    assert board.get(WIDTH - 1, HEIGHT - 1) == DEFAULT_COLOR_ID
+    assert board.get_range(0, 0, WIDTH, HEIGHT) == [DEFAULT_COLOR_ID] * (WIDTH * HEIGHT)
+    assert board.get_stats()["chunks_allocated"] == 0
+
+
+def test_default_color_write_does_not_allocate():
+    board = ChunkedBoard(WIDTH, HEIGHT, CHUNK)
+    assert board.set(3, 4, DEFAULT_COLOR_ID) == DEFAULT_COLOR_ID
+
+    stats = board.get_stats()
+    assert stats["chunks_allocated"] == 0
+    assert stats["allocated_bytes"] == 0
+
+
+def test_write_allocates_only_its_chunk():
+    board = ChunkedBoard(WIDTH, HEIGHT, CHUNK)
+    board.set(CHUNK + 1, 2 * CHUNK + 3, 2)
+
+    stats = board.get_stats()
+    assert stats["chunks_total"] == board.chunks_x * board.chunks_y == 5 * 3
+    assert stats["chunks_allocated"] == 1
+    assert stats["allocated_bytes"] == CHUNK * CHUNK
+    assert stats["chunks"][0]["x"] == 1
+    assert stats["chunks"][0]["y"] == 2
+    assert board.get(CHUNK + 1, 2 * CHUNK + 3) == 2
+
+
+def test_set_returns_previous_color():
+    board = ChunkedBoard(WIDTH, HEIGHT, CHUNK)
+    assert board.set(5, 5, 1) == DEFAULT_COLOR_ID
+    assert board.set(5, 5, 3) == 1
+    assert board.set(5, 5, DEFAULT_COLOR_ID) == 3
+
+
+def test_occupancy_counts_non_default_pixels():
+    board = ChunkedBoard(WIDTH, HEIGHT, CHUNK)
+
+    def occupied() -> int:
+        return board.get_stats()["chunks"][0]["occupied"]
+
+    board.set(0, 0, 1)
+    board.set(1, 0, 2)
+    assert occupied() == 2
+
+    # Перекраска в другой не-дефолтный цвет не меняет заполненность
+    board.set(0, 0, 3)
+    assert occupied() == 2
+
+    board.set(0, 0, DEFAULT_COLOR_ID)
+    assert occupied() == 1
+    board.set(0, 0, DEFAULT_COLOR_ID)
+    assert occupied() == 1
+
+    board.set(1, 0, DEFAULT_COLOR_ID)
+    assert occupied() == 0
+    assert board.get_stats()["chunks"][0]["occupancy"] == 0.0
+    # Чанк остаётся выделенным
+    assert board.get_stats()["chunks_allocated"] == 1
+
+
+def test_get_range_order_across_chunks_and_padded_edge():
+    board = ChunkedBoard(WIDTH, HEIGHT, CHUNK)
+    dense = [[DEFAULT_COLOR_ID] * WIDTH for _ in range(HEIGHT)]
+    rng = random.Random(0)
+    for _ in range(400):
+        x, y, color_id = rng.randrange(WIDTH), rng.randrange(HEIGHT), rng.randrange(4)
+        board.set(x, y, color_id)
+        dense[y][x] = color_id
+
+    # Порядок обхода как в PixelBoard.get_pixel_range: внешний цикл по x, внутренний по y
+    for x, y, x_end, y_end in [(0, 0, WIDTH, HEIGHT), (5, 3, 20, 19), (CHUNK - 1, CHUNK - 1, CHUNK + 1, CHUNK + 1),
+                               (32, 16, WIDTH, HEIGHT)]:
+        expected = [dense[j][i] for i in range(x, x_end) for j in range(y, y_end)]
+        assert board.get_range(x, y, x_end, y_end) == expected
+
+    for y in range(HEIGHT):
+        for x in range(WIDTH):
+            assert board.get(x, y) == dense[y][x]
+
+
+def test_pixel_board_range_matches_dense_reference():
+    config = SimpleNamespace(
+        is_volatile_mode=True,
+        board_chunk_size=CHUNK,
+        stats_tile_size=8,
+        stats_bucket_seconds=60,
+        stats_windows=[60],
+    )
+    board = PixelBoard(WIDTH, HEIGHT, PALETTE, None, config)
+    dense = [[PALETTE.colors[0]] * WIDTH for _ in range(HEIGHT)]
+    rng = random.Random(1)
+    for _ in range(300):
+        x, y, color_id = rng.randrange(WIDTH), rng.randrange(HEIGHT), rng.randrange(4)
+        board.set_pixel(x, y, color_id)
+        dense[y][x] = PALETTE.colors[color_id]
+
+    pixels = board.get_pixel_range(2, 1, WIDTH, HEIGHT)
+    assert [(p.x, p.y, p.color) for p in pixels] == [
+        (i, j, dense[j][i]) for i in range(2, WIDTH) for j in range(1, HEIGHT)
+    ]
+
+    as_dicts = board.get_pixel_range(2, 1, WIDTH, HEIGHT, asdictionary=True)
+    assert as_dicts == [
+        {"x": i, "y": j, "color": {"hex": dense[j][i].hex, "color_id": dense[j][i].color_id}}
+        for i in range(2, WIDTH) for j in range(1, HEIGHT)
+    ]